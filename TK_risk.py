@@ -1,11 +1,15 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog
+from tkinter import filedialog, messagebox, simpledialog, ttk
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import json
-from matplotlib.colors import LinearSegmentedColormap
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import LinearSegmentedColormap, Normalize
 
 # Corporate color scheme
 NAVY_BLUE = "#001f3f"
@@ -13,32 +17,125 @@ GOLD = "#FFD700"
 YELLOW = "#FFFF00"
 ORANGE = "#FFA500"
 
+# Labels the charts group by
+GROUP_COLUMNS = ["Initiative", "Division"]
+
+# Mapping used when risk_config.json is missing or unreadable
+DEFAULT_RISK_MAPPING = {"Critical Focus": 5, "Enhanced Focus": 3, "On Track": 1}
+
+# CSV files larger than this are scored chunk by chunk instead of loaded whole
+LARGE_CSV_BYTES = 100 * 1024 * 1024
+CSV_CHUNK_ROWS = 100_000
+# Column dtypes for every CSV read, so a file scores the same whether it is
+# loaded whole or streamed in chunks
+CSV_DTYPE_OPTIONS = {"dtype_backend": "pyarrow"}
+
+# Files are loaded and scored on one worker thread; the Tk main loop polls it
+# and handles the events it posts (error dialogs, progress) on this queue.
+LOAD_POLL_MS = 50
+load_executor = ThreadPoolExecutor(max_workers=1)
+ui_events = queue.Queue()
+current_load = None
+
+# matplotlib's figure machinery and Tk backend are imported on first use
+# (see _ensure_mpl) so the window opens without waiting for them
+Figure = None
+FigureCanvasTkAgg = None
+
 # Global variables to hold the current matplotlib figure and data
 current_fig = None
 current_df = None
+# Axes, colorbar and Tk canvas created with the first chart and redrawn in place
+current_chart_frame = None
+current_ax = None
+current_cbar = None
+current_canvas = None
+# Subplot specs of the axes without and with the colorbar beside it
+current_ax_specs = None
+# Bubble scatter plus the state its cached background was captured in, for blitted redraws
+current_bubble = None
+# Chart inputs precomputed once per loaded file so chart switches skip the aggregation
+current_inits = None
+current_divs = None
+current_pivot = None
+current_agg_xy = None
+
+# Corporate colormap, built once at import and shared by every chart
+_CORP_CMAP = LinearSegmentedColormap.from_list("corp_map", [NAVY_BLUE, GOLD, YELLOW, ORANGE])
+
+# RGBA table of the corporate colormap, so bubble colours are a plain array gather
+CORPORATE_RGBA = _CORP_CMAP(np.linspace(0, 1, 256))
 
 def get_corporate_cmap():
     """Return a custom colormap based on the corporate colours."""
-    corporate_colors = [NAVY_BLUE, GOLD, YELLOW, ORANGE]
-    return LinearSegmentedColormap.from_list("corp_map", corporate_colors)
+    return _CORP_CMAP
+
+def _rating_labels(values):
+    """Return values as the label Index used for both mapping keys and lookups.
+    Labels are stripped, and whole numbers lose any ".0", so 5 read as an Arrow
+    integer and 5.0 read as a NumPy float (or saved that way in a config) match."""
+    labels = np.asarray(pd.Index(values).astype(str).str.strip(), dtype=object)
+    nums = pd.to_numeric(labels, errors="coerce")
+    with np.errstate(invalid="ignore"):  # nan/inf labels are simply not whole numbers
+        whole = np.isfinite(nums) & (nums % 1 == 0) & (np.abs(nums) < 2**53)
+    labels[whole] = nums[whole].astype(np.int64).astype(str)
+    return pd.Index(labels, dtype=object)
+
+def build_score_lookup(risk_mapping):
+    """Return the mapping's labels as an Index plus a score lookup table aligned with it.
+    The extra trailing slot holds the default score of 1 for labels missing from the mapping.
+    Keys that normalize to the same label (e.g. "5" and "5.0") keep the first one's score."""
+    labels = _rating_labels(list(risk_mapping))
+    first = ~labels.duplicated()
+    categories = labels[first]
+    # Anything that is not a number (e.g. the per-column dicts of the nested
+    # config format) scores the default 1, so the table is always numeric
+    scores = [score for score, keep in zip(risk_mapping.values(), first) if keep]
+    values = pd.Series(scores + [1], dtype=object)
+    values = values.where(values.map(lambda v: isinstance(v, (int, float, str, np.number))))
+    lut = pd.to_numeric(values, errors="coerce").fillna(1).to_numpy()
+    if lut.dtype.kind == "f" and (lut % 1 == 0).all():
+        lut = lut.astype(np.int64)
+    # int8 only when every score is small enough (|score| <= 31) that the
+    # int16 product of three ratings cannot overflow
+    if lut.dtype.kind == "i":
+        lut = lut.astype(np.int8 if np.abs(lut).max() <= 31 else np.int32)
+    lut.flags.writeable = False  # shared through the cache below
+    return categories, lut
+
+@lru_cache(maxsize=4)
+def _load_risk_config(filename, mtime_ns, size):
+    """Parse a mapping file and build its lookup table.
+    Cached per file version; the modification time and size in the key mean
+    an edited file is re-read automatically."""
+    with open(filename, 'r') as f:
+        config = json.load(f)
+    if isinstance(config, dict) and "risk_mapping" in config:
+        mapping = config["risk_mapping"]
+    elif isinstance(config, dict):
+        mapping = config
+    else:
+        mapping = DEFAULT_RISK_MAPPING
+    return mapping, build_score_lookup(mapping)
+
+def _risk_config(filename):
+    """Return the (mapping, lookup) pair for filename, falling back to the default mapping on error."""
+    try:
+        st = os.stat(filename)
+        return _load_risk_config(filename, st.st_mtime_ns, st.st_size)
+    except Exception as e:
+        print("Error loading risk mapping:", e)
+        return DEFAULT_RISK_MAPPING, build_score_lookup(DEFAULT_RISK_MAPPING)
 
 def load_risk_mapping(filename='risk_config.json'):
     """Load risk mapping from a JSON file.
     If the file contains a dictionary with a "risk_mapping" key, use that;
     otherwise assume the file itself is a mapping. Returns a default mapping on error."""
-    default_mapping = {"Critical Focus": 5, "Enhanced Focus": 3, "On Track": 1}
-    try:
-        with open(filename, 'r') as f:
-            config = json.load(f)
-        if isinstance(config, dict) and "risk_mapping" in config:
-            return config["risk_mapping"]
-        elif isinstance(config, dict):
-            return config
-        else:
-            return default_mapping
-    except Exception as e:
-        print("Error loading risk mapping:", e)
-        return default_mapping
+    return dict(_risk_config(filename)[0])  # copy so callers cannot alter the cached mapping
+
+def risk_score_lookup(filename='risk_config.json'):
+    """Return the label Index and score lookup table for the mapping in filename."""
+    return _risk_config(filename)[1]
 
 def edit_risk_mapping():
     """Open a window that allows users to update category labels and scores."""
@@ -109,156 +206,302 @@ def edit_risk_mapping():
     save_button = tk.Button(edit_win, text="Save Mapping", command=save_mapping, bg=GOLD, fg=NAVY_BLUE)
     save_button.pack(pady=5)
 
+def report_error(title, message):
+    """Show an error dialog; from the load worker the dialog is deferred to the Tk main loop."""
+    if threading.current_thread() is threading.main_thread():
+        messagebox.showerror(title, message)
+    else:
+        ui_events.put(("error", title, message))
+
+def _read_with_fast_engine(reader, filename, **fast_kwargs):
+    """Read with an accelerated engine, falling back to pandas' default engine
+    when the optional package behind it (pyarrow, python-calamine) is not installed."""
+    try:
+        return reader(filename, **fast_kwargs)
+    except ImportError:
+        return reader(filename)
+
 def load_data(filename):
-    """Load compliance risk data from a CSV or Excel file."""
+    """Load compliance risk data from a CSV, Excel or Parquet file."""
     try:
         if filename.endswith('.csv'):
-            df = pd.read_csv(filename)
+            df = _read_with_fast_engine(pd.read_csv, filename, engine="pyarrow", **CSV_DTYPE_OPTIONS)
         elif filename.endswith('.xlsx'):
-            df = pd.read_excel(filename)
+            df = _read_with_fast_engine(pd.read_excel, filename, engine="calamine")
+        elif filename.endswith('.parquet'):
+            df = pd.read_parquet(filename, engine="pyarrow")
         else:
-            messagebox.showerror("Unsupported File", "Please upload a CSV or Excel file.")
+            report_error("Unsupported File", "Please upload a CSV, Excel or Parquet file.")
             return None
         return df
     except Exception as e:
-        messagebox.showerror("File Error", f"An error occurred while loading the file: {e}")
+        report_error("File Error", f"An error occurred while loading the file: {e}")
         return None
 
 def convert_text_to_numeric(df):
     """Convert text-based risk ratings to numeric ratings using a configurable mapping."""
-    risk_mapping = load_risk_mapping()  # load mapping from external JSON
-    
+    # Labels and score lookup table for the mapping in the external JSON
+    categories, lut = risk_score_lookup()
+
     for col in ["Severity", "Implementation Period", "Impact"]:
         if col in df.columns:
-            df[col] = df[col].astype(str).str.strip()  # Remove extra spaces
-            df[col] = df[col].map(risk_mapping)
-            # If mapping fails, default to 1
-            if df[col].isnull().any():
-                df[col] = df[col].fillna(1)
+            # Strip and look up each distinct label once, then broadcast the
+            # result back to the rows through the factorized codes.
+            row_codes, uniques = pd.factorize(df[col])
+            labels = _rating_labels(uniques)  # Remove extra spaces, drop ".0" from whole numbers
+            # Unknown labels (and missing values, whose row code is -1) end
+            # up at code -1, which selects the default slot.
+            label_codes = np.append(categories.get_indexer(labels), -1)
+            df[col] = lut[label_codes[row_codes]]
     return df
 
 def calculate_risk_score(df):
     """Calculate risk scores based on Severity, Implementation Period, and Impact."""
     df = convert_text_to_numeric(df)
-    
+
+    # Rows without an Initiative or Division cannot be placed on any chart
+    group_cols = [col for col in GROUP_COLUMNS if col in df.columns]
+    if group_cols:
+        df = df.dropna(subset=group_cols)
+
+    # Normalise the grouping labels once so every chart sees the same keys,
+    # stored as categoricals so grouping works on integer codes
+    for col in group_cols:
+        df[col] = df[col].astype(str).str.strip().astype("category")
+
     required_cols = {"Severity", "Implementation Period", "Impact"}
     if not required_cols.issubset(df.columns):
-        messagebox.showerror("Missing Columns", "The required columns for risk calculation are missing.")
+        report_error("Missing Columns", "The required columns for risk calculation are missing.")
         return df
 
-    df['Risk Score'] = df['Severity'] * df['Implementation Period'] * df['Impact']
-    df['Risk Score'] = df['Risk Score'].astype(float)
+    # Multiply the raw arrays in one pass; int8 scores are widened to int16 so
+    # the product cannot overflow. The score stays int16 (float only when the
+    # mapping has fractional scores) and is converted to float at plot time.
+    severity = df['Severity'].to_numpy()
+    severity = severity.astype(np.promote_types(severity.dtype, np.int16))
+    period = df['Implementation Period'].to_numpy()
+    impact = df['Impact'].to_numpy()
+    df['Risk Score'] = severity * period * impact
+
+    # Filter unscored rows here, once, so the charts can use the frame as is
+    valid = df['Risk Score'].notna()
+    if not valid.all():
+        df = df.loc[valid].reset_index(drop=True)
     
     return df
 
-def visualize_risk_bubble(df, parent_frame):
-    """Generate and embed a risk assessment bubble chart in the given Tkinter frame."""
-    global current_fig
-    custom_cmap = get_corporate_cmap()
+def load_scored_csv_chunks(filename, progress=None):
+    """Stream a large CSV through calculate_risk_score in chunks, keeping only
+    the columns the charts need so the full table is never held in memory.
+    progress, if given, is called with the number of rows scored so far."""
+    keep = ["Initiative", "Division", "Risk Score"]
+    try:
+        scored = []
+        rows = 0
+        with pd.read_csv(filename, chunksize=CSV_CHUNK_ROWS, memory_map=True, **CSV_DTYPE_OPTIONS) as reader:
+            for chunk in reader:
+                chunk = calculate_risk_score(chunk)
+                scored.append(chunk[[col for col in keep if col in chunk.columns]])
+                rows += len(chunk)
+                if progress is not None:
+                    progress(rows)
+        df = pd.concat(scored, ignore_index=True)
+        # Chunks carry different category sets, which concat turns back into strings
+        for col in GROUP_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        return df
+    except Exception as e:
+        report_error("File Error", f"An error occurred while loading the file: {e}")
+        return None
 
-    required_columns = {"Initiative", "Division", "Risk Score"}
-    missing_columns = required_columns - set(df.columns)
-    if missing_columns:
-        messagebox.showerror("Missing Data", f"The following required columns are missing: {missing_columns}")
+def load_and_score(filename, progress=None):
+    """Load a data file and calculate its risk scores.
+    Safe to run off the Tk main thread; progress is passed on to the chunked CSV reader."""
+    if filename.endswith('.csv') and os.path.getsize(filename) > LARGE_CSV_BYTES:
+        header = pd.read_csv(filename, nrows=0).columns
+        # Only stream when every chunk can be scored; otherwise let the regular
+        # path report the missing columns once.
+        if {"Severity", "Implementation Period", "Impact"}.issubset(header):
+            return load_scored_csv_chunks(filename, progress)
+    df = load_data(filename)
+    if df is None:
+        return None
+    return calculate_risk_score(df)
+
+def aggregate_risk_scores(df):
+    """Average Risk Score for every Initiative/Division pair.
+    Returns the sorted initiatives and divisions, the matrix of mean scores
+    (0 where a pair has no rows) and the matching matrix of row counts.
+    Expects the cleaned frame from calculate_risk_score (no missing keys or scores)."""
+    i_codes, initiatives = pd.factorize(df["Initiative"], sort=True)
+    d_codes, divisions = pd.factorize(df["Division"], sort=True)
+    # Linearize each (initiative, division) pair into one cell index so sums
+    # and counts are single bincount passes over flat arrays
+    n_cells = len(initiatives) * len(divisions)
+    cells = i_codes * len(divisions) + d_codes
+    shape = (len(initiatives), len(divisions))
+    sums = np.bincount(cells, weights=df["Risk Score"].to_numpy(), minlength=n_cells).reshape(shape)
+    counts = np.bincount(cells, minlength=n_cells).reshape(shape)
+    means = sums / np.maximum(counts, 1)
+    return initiatives, divisions, means, counts
+
+def missing_chart_columns(df):
+    """Return the columns the charts need that are absent from df."""
+    return {"Initiative", "Division", "Risk Score"} - set(df.columns)
+
+def update_chart_data(df):
+    """Precompute the pivot table and bubble coordinates shared by every chart type."""
+    global current_inits, current_divs, current_pivot, current_agg_xy
+    current_inits = current_divs = current_pivot = current_agg_xy = None
+    if missing_chart_columns(df):
         return
 
-    df["Initiative"] = df["Initiative"].astype(str).str.strip()
-    df["Division"] = df["Division"].astype(str).str.strip()
-    df = df.dropna(subset=["Risk Score"])
-
-    agg_df = df.groupby(["Initiative", "Division"]).agg({"Risk Score": "mean"}).reset_index()
-
-    divisions = sorted(agg_df["Division"].unique())
-    initiatives = sorted(agg_df["Initiative"].unique())
-    division_to_idx = {d: i for i, d in enumerate(divisions)}
-    initiative_to_idx = {i: j for j, i in enumerate(initiatives)}
-    agg_df["x"] = agg_df["Division"].map(division_to_idx)
-    agg_df["y"] = agg_df["Initiative"].map(initiative_to_idx)
-
-    sizes = agg_df["Risk Score"] * 100
-
-    current_fig = plt.figure(figsize=(8, 6), facecolor="white")
-    scatter = plt.scatter(agg_df["x"], agg_df["y"], s=sizes, c=agg_df["Risk Score"],
-                          cmap=custom_cmap, alpha=0.8, edgecolors="black")
-    cbar = plt.colorbar(scatter)
-    cbar.set_label("Risk Score", color=NAVY_BLUE)
-    
-    plt.xticks(ticks=range(len(divisions)), labels=divisions, rotation=45, color=NAVY_BLUE)
-    plt.yticks(ticks=range(len(initiatives)), labels=initiatives, color=NAVY_BLUE)
-    plt.xlabel("Division", color=NAVY_BLUE)
-    plt.ylabel("Initiative", color=NAVY_BLUE)
-    plt.title("Compliance Risk Bubble Chart", color=NAVY_BLUE)
-    plt.tight_layout()
-
-    canvas = FigureCanvasTkAgg(current_fig, master=parent_frame)
+    initiatives, divisions, means, counts = aggregate_risk_scores(df)
+    current_inits = initiatives
+    current_divs = divisions
+    # Empty Initiative/Division pairs stay at 0, as in a pivot_table with fill_value=0
+    current_pivot = pd.DataFrame(means,
+                                 index=pd.Index(initiatives, name="Initiative"),
+                                 columns=pd.Index(divisions, name="Division"))
+    # Only pairs that actually have rows get a bubble; matplotlib stores
+    # offsets, sizes and colour values as float32, so hand them over as such.
+    y, x = np.nonzero(counts)
+    scores = means[y, x].astype(np.float32)
+    current_agg_xy = (x.astype(np.float32), y.astype(np.float32),
+                      scores * np.float32(100), scores)
+
+def _ensure_mpl():
+    """Import the matplotlib Figure and Tk canvas classes the first time a chart is drawn."""
+    global Figure, FigureCanvasTkAgg
+    if Figure is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+def create_chart_canvas(parent_frame):
+    """Create the single figure, axes, colorbar and Tk canvas reused by every chart."""
+    global current_fig, current_ax, current_cbar, current_canvas, current_ax_specs
+    _ensure_mpl()
+    current_fig = Figure(figsize=(8, 6), facecolor="white")
+    current_ax = current_fig.add_subplot()
+    full_spec = current_ax.get_subplotspec()
+    # The colorbar follows this mappable; charts only update its limits
+    mappable = ScalarMappable(norm=Normalize(), cmap=get_corporate_cmap())
+    current_cbar = current_fig.colorbar(mappable, ax=current_ax)
+    current_cbar.set_label("Risk Score", color=NAVY_BLUE)
+    current_ax_specs = (full_spec, current_ax.get_subplotspec())
+    show_colorbar(current_ax, current_cbar, False)
+    current_canvas = FigureCanvasTkAgg(current_fig, master=parent_frame)
+    current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+def show_colorbar(ax, cbar, visible):
+    """Show or hide the shared colorbar; a hidden colorbar gives its width back to the chart."""
+    cbar.ax.set_visible(visible)
+    cbar.ax.set_in_layout(visible)
+    ax.set_subplotspec(current_ax_specs[1 if visible else 0])
+
+def show_empty_chart(ax, cbar, canvas):
+    """Clear the shared axes and say there is nothing to plot."""
+    ax.clear()
+    show_colorbar(ax, cbar, False)
+    ax.set_axis_off()
+    ax.text(0.5, 0.5, "No rows with an Initiative, Division and Risk Score to chart.",
+            ha="center", va="center", color=NAVY_BLUE, transform=ax.transAxes)
+    ax.figure.tight_layout()
+    canvas.draw_idle()
+
+def visualize_risk_bubble(agg_xy, initiatives, divisions, ax, cbar, canvas):
+    """Draw a risk assessment bubble chart into the shared axes and canvas.
+    agg_xy holds the x, y, size and colour arrays prepared by update_chart_data.
+    When the bubble chart is already on screen with the same labels, colour
+    limits and canvas size, only the scatter is redrawn over the cached background."""
+    global current_bubble
+    x, y, sizes, scores = agg_xy
+    clim = (scores.min(), scores.max())
+    # Colour each bubble straight from the RGBA table, using the colorbar's limits
+    norm = Normalize(*clim)
+    idx = (np.clip(norm(scores), 0, 1) * (len(CORPORATE_RGBA) - 1)).astype(np.uint8)
+    colors = CORPORATE_RGBA[idx]
+
+    state = (list(initiatives), list(divisions), clim, canvas.get_width_height())
+    if current_bubble is not None:
+        scatter, background, drawn_state = current_bubble
+        if scatter in ax.collections and drawn_state == state:
+            scatter.set_offsets(np.column_stack([x, y]))
+            scatter.set_sizes(sizes)
+            scatter.set_facecolors(colors)
+            scatter.set_alpha(0.8)
+            canvas.restore_region(background)
+            ax.draw_artist(scatter)
+            canvas.blit(ax.bbox)
+            return
+
+    ax.clear()
+    cbar.mappable.set_clim(*clim)
+    show_colorbar(ax, cbar, True)
+    scatter = ax.scatter(x, y, s=sizes, c=colors, alpha=0.8, edgecolors="black",
+                         rasterized=True)
+
+    ax.set_xticks(range(len(divisions)), labels=divisions, rotation=45, color=NAVY_BLUE)
+    ax.set_yticks(range(len(initiatives)), labels=initiatives, color=NAVY_BLUE)
+    ax.set_xlabel("Division", color=NAVY_BLUE)
+    ax.set_ylabel("Initiative", color=NAVY_BLUE)
+    ax.set_title("Compliance Risk Bubble Chart", color=NAVY_BLUE)
+    ax.figure.tight_layout()
+
+    # Render everything except the bubbles once and keep it as the blit background
+    scatter.set_visible(False)
     canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-def visualize_risk_heatmap(df, parent_frame):
-    """Generate and embed a risk assessment heatmap in the given Tkinter frame."""
-    global current_fig
+    background = canvas.copy_from_bbox(ax.bbox)
+    scatter.set_visible(True)
+    ax.draw_artist(scatter)
+    canvas.blit(ax.bbox)
+    current_bubble = (scatter, background, state)
+
+def visualize_risk_heatmap(pivot_df, ax, cbar, canvas):
+    """Draw a risk assessment heatmap into the shared axes and canvas."""
     custom_cmap = get_corporate_cmap()
 
-    required_columns = {"Initiative", "Division", "Risk Score"}
-    missing_columns = required_columns - set(df.columns)
-    if missing_columns:
-        messagebox.showerror("Missing Data", f"The following required columns are missing: {missing_columns}")
-        return
-
-    df["Initiative"] = df["Initiative"].astype(str).str.strip()
-    df["Division"] = df["Division"].astype(str).str.strip()
-    df = df.dropna(subset=["Risk Score"])
-
-    pivot_df = df.pivot_table(index="Initiative", columns="Division", values="Risk Score", aggfunc="mean")
-    pivot_df = pivot_df.fillna(0)
-
-    current_fig = plt.figure(figsize=(8, 6), facecolor="white")
-    ax = current_fig.add_subplot(111)
-    sns.heatmap(pivot_df, annot=True, fmt=".1f", cmap=custom_cmap, ax=ax,
-                cbar_kws={"label": "Risk Score"}, annot_kws={"color": NAVY_BLUE})
+    ax.clear()
+    mat = pivot_df.to_numpy(np.float32)
+    cbar.mappable.set_clim(mat.min(), mat.max())
+    show_colorbar(ax, cbar, True)
+    ax.imshow(mat, cmap=custom_cmap, norm=cbar.norm, aspect="auto", interpolation="nearest")
+    # Annotate only populated cells; empty Initiative/Division pairs are 0
+    for i, j in zip(*np.nonzero(mat)):
+        ax.text(j, i, f"{mat[i, j]:.1f}", ha="center", va="center", color=NAVY_BLUE)
+
+    ax.set_xticks(range(mat.shape[1]), labels=pivot_df.columns)
+    ax.set_yticks(range(mat.shape[0]), labels=pivot_df.index)
+    ax.set_xlabel("Division", color=NAVY_BLUE)
+    ax.set_ylabel("Initiative", color=NAVY_BLUE)
     ax.set_title("Compliance Risk Heatmap", color=NAVY_BLUE)
     ax.tick_params(axis='x', colors=NAVY_BLUE)
     ax.tick_params(axis='y', colors=NAVY_BLUE)
-    current_fig.tight_layout()
+    ax.figure.tight_layout()
 
-    canvas = FigureCanvasTkAgg(current_fig, master=parent_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    canvas.draw_idle()
 
-def visualize_risk_stacked_bar(df, parent_frame):
-    """Generate and embed a risk assessment stacked bar chart in the given Tkinter frame."""
-    global current_fig
+def visualize_risk_stacked_bar(pivot_df, ax, cbar, canvas):
+    """Draw a risk assessment stacked bar chart into the shared axes and canvas."""
     custom_cmap = get_corporate_cmap()
 
-    required_columns = {"Initiative", "Division", "Risk Score"}
-    missing_columns = required_columns - set(df.columns)
-    if missing_columns:
-        messagebox.showerror("Missing Data", f"The following required columns are missing: {missing_columns}")
-        return
-
-    df["Initiative"] = df["Initiative"].astype(str).str.strip()
-    df["Division"] = df["Division"].astype(str).str.strip()
-    df = df.dropna(subset=["Risk Score"])
-
-    pivot_df = df.pivot_table(index="Initiative", columns="Division", values="Risk Score", aggfunc="mean", fill_value=0)
-
-    current_fig, ax = plt.subplots(figsize=(8, 6), facecolor="white")
+    ax.clear()
+    show_colorbar(ax, cbar, False)
     pivot_df.plot(kind='bar', stacked=True, ax=ax, colormap=custom_cmap)
     ax.set_title("Compliance Risk Stacked Bar Chart", color=NAVY_BLUE)
     ax.set_xlabel("Initiative", color=NAVY_BLUE)
     ax.set_ylabel("Risk Score", color=NAVY_BLUE)
     ax.tick_params(axis='x', colors=NAVY_BLUE)
     ax.tick_params(axis='y', colors=NAVY_BLUE)
-    current_fig.tight_layout()
+    ax.figure.tight_layout()
 
-    canvas = FigureCanvasTkAgg(current_fig, master=parent_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    canvas.draw_idle()
 
 def save_chart():
     """Save the currently displayed chart to a file."""
     global current_fig
-    if current_fig is None:
+    if current_fig is None or not current_ax.has_data():
         messagebox.showwarning("No Chart", "There is no chart to save.")
         return
 
@@ -273,37 +516,82 @@ def save_chart():
         except Exception as e:
             messagebox.showerror("Save Error", f"An error occurred while saving the chart: {e}")
 
-def draw_chart(chart_frame, chart_type):
+def draw_chart(chart_type):
     """Draw the selected chart type using the currently loaded data."""
     global current_df
     if current_df is None:
         messagebox.showwarning("No Data", "No data loaded. Please load a file first.")
         return
 
-    # Clear the chart frame before drawing the new chart
-    for widget in chart_frame.winfo_children():
-        widget.destroy()
+    missing_columns = missing_chart_columns(current_df)
+    if missing_columns:
+        messagebox.showerror("Missing Data", f"The following required columns are missing: {missing_columns}")
+        return
+
+    if current_canvas is None:
+        create_chart_canvas(current_chart_frame)
+
+    if current_pivot.empty:
+        show_empty_chart(current_ax, current_cbar, current_canvas)
+        return
 
     if chart_type.get() == "Bubble Chart":
-        visualize_risk_bubble(current_df, chart_frame)
+        visualize_risk_bubble(current_agg_xy, current_inits, current_divs,
+                              current_ax, current_cbar, current_canvas)
     elif chart_type.get() == "Heatmap":
-        visualize_risk_heatmap(current_df, chart_frame)
+        visualize_risk_heatmap(current_pivot, current_ax, current_cbar, current_canvas)
     elif chart_type.get() == "Stacked Bar Chart":
-        visualize_risk_stacked_bar(current_df, chart_frame)
+        visualize_risk_stacked_bar(current_pivot, current_ax, current_cbar, current_canvas)
     else:
         messagebox.showerror("Unknown Chart", f"Chart type '{chart_type.get()}' is not supported.")
 
-def on_load_file(chart_frame, chart_type):
-    """Handler for file loading: loads data, calculates risk scores, and draws the selected chart."""
-    global current_df
-    file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx")])
+def on_load_file(chart_type, progress_bar, status):
+    """Handler for file loading: loads data and calculates risk scores on a worker
+    thread so the window stays responsive, then draws the selected chart."""
+    global current_load
+    if current_load is not None and not current_load.done():
+        messagebox.showwarning("Loading", "A file is still loading. Please wait for it to finish.")
+        return
+    file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"),
+                                                      ("Parquet files", "*.parquet")])
     if file_path:
-        df = load_data(file_path)
-        if df is not None:
-            current_df = calculate_risk_score(df)
-            draw_chart(chart_frame, chart_type)
+        current_load = load_executor.submit(load_and_score, file_path,
+                                            lambda rows: ui_events.put(("progress", rows)))
+        status.set(f"Loading {os.path.basename(file_path)}...")
+        progress_bar.start()
+        progress_bar.after(LOAD_POLL_MS, poll_load, chart_type, progress_bar, status)
+
+def poll_load(chart_type, progress_bar, status):
+    """Handle events from the background load and draw the chart once it has finished."""
+    global current_df
+    finished = current_load.done()
+    while True:
+        try:
+            event = ui_events.get_nowait()
+        except queue.Empty:
+            break
+        if event[0] == "error":
+            messagebox.showerror(event[1], event[2])
+        elif event[0] == "progress":
+            status.set(f"Loaded {event[1]:,} rows...")
+    if not finished:
+        progress_bar.after(LOAD_POLL_MS, poll_load, chart_type, progress_bar, status)
+        return
+
+    progress_bar.stop()
+    status.set("")
+    try:
+        df = current_load.result()
+    except Exception as e:
+        messagebox.showerror("File Error", f"An error occurred while loading the file: {e}")
+        return
+    if df is not None:
+        current_df = df
+        update_chart_data(current_df)
+        draw_chart(chart_type)
 
 def main():
+    global current_chart_frame
     root = tk.Tk()
     root.title("Risk Assessment Dashboard")
     root.geometry("900x700")
@@ -323,12 +611,12 @@ def main():
     chart_type_menu.pack(side=tk.LEFT, padx=5)
     
     load_button = tk.Button(top_frame, text="Load Data File",
-                            command=lambda: on_load_file(chart_frame, chart_type),
+                            command=lambda: on_load_file(chart_type, load_progress, load_status),
                             bg=GOLD, fg=NAVY_BLUE)
     load_button.pack(side=tk.LEFT, padx=5)
     
     refresh_button = tk.Button(top_frame, text="Refresh Chart",
-                               command=lambda: draw_chart(chart_frame, chart_type),
+                               command=lambda: draw_chart(chart_type),
                                bg=GOLD, fg=NAVY_BLUE)
     refresh_button.pack(side=tk.LEFT, padx=5)
     
@@ -340,9 +628,17 @@ def main():
                             bg=GOLD, fg=NAVY_BLUE)
     save_button.pack(side=tk.LEFT, padx=5)
     
+    # Progress indicator for files loading in the background
+    load_progress = ttk.Progressbar(top_frame, mode="indeterminate", length=100)
+    load_progress.pack(side=tk.LEFT, padx=5)
+    load_status = tk.StringVar()
+    status_label = tk.Label(top_frame, textvariable=load_status, bg=NAVY_BLUE, fg=GOLD)
+    status_label.pack(side=tk.LEFT, padx=5)
+    
     # Chart frame with a white background for contrast
     chart_frame = tk.Frame(root, bg="white")
     chart_frame.pack(fill=tk.BOTH, expand=True)
+    current_chart_frame = chart_frame
     
     root.mainloop()
 
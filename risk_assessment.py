@@ -1,9 +1,11 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.figure import Figure
 import json
 import io
+import os
+import functools
 from matplotlib.colors import LinearSegmentedColormap
 
 # Corporate color scheme
@@ -12,36 +14,86 @@ GOLD = "#FFD700"
 YELLOW = "#FFFF00"
 ORANGE = "#FFA500"
 
+# Built once at import; every chart shares it
+_CORP_CMAP = LinearSegmentedColormap.from_list("corp_map", [NAVY_BLUE, GOLD, YELLOW, ORANGE])
+
 def get_corporate_cmap():
-    corporate_colors = [NAVY_BLUE, GOLD, YELLOW, ORANGE]
-    return LinearSegmentedColormap.from_list("corp_map", corporate_colors)
+    return _CORP_CMAP
+
+# orjson is optional: same bytes-in/bytes-out helpers over the stdlib json module
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        # Non-str keys (e.g. numeric Excel headers) are converted, as json.dumps does
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=4).encode()
+
+    _json_loads = json.loads
+
+# Parsed config per file version; callers treat the returned mapping as read-only
+@functools.lru_cache(maxsize=8)
+def _load_cached(filename, mtime_ns, size):
+    with open(filename, 'rb') as f:
+        return _json_loads(f.read())
 
 def load_risk_mapping(filename='risk_config.json'):
     try:
-        with open(filename, 'r') as f:
-            return json.load(f)
+        stat = os.stat(filename)
+        return _load_cached(filename, stat.st_mtime_ns, stat.st_size)
     except Exception:
         return {}
 
 def save_risk_mapping(mapping, filename='risk_config.json'):
-    with open(filename, 'w') as f:
-        json.dump(mapping, f, indent=4)
+    new = _json_dumps(mapping)
+    try:
+        with open(filename, 'rb') as f:
+            if f.read() == new:
+                return  # unchanged; keep the file (and the cached parse) as is
+    except FileNotFoundError:
+        pass
+    # Write beside the target and swap it in, so readers never see a partial file
+    tmp = filename + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(new)
+    os.replace(tmp, filename)
+    _load_cached.cache_clear()
+
+# Default scores for common rating labels; anything else scores 1
+_PREDEFINED = {"Critical": 5, "High": 4, "Medium": 3, "Low": 2, "Minimal": 1}
+
+# The one spelling of a rating value used for mapping keys and for lookups alike:
+# stripped text, with whole numbers written without a ".0". Arrow reads a blank-
+# containing integer column as 5, NumPy (and configs saved from it) as 5.0.
+def _rating_labels(values):
+    labels = np.asarray(pd.Index(values).astype(str).str.strip(), dtype=object)
+    nums = pd.to_numeric(labels, errors="coerce")
+    with np.errstate(invalid="ignore"):  # nan/inf labels are simply not whole numbers
+        whole = np.isfinite(nums) & (nums % 1 == 0) & (np.abs(nums) < 2**53)
+    labels[whole] = nums[whole].astype(np.int64).astype(str)
+    return pd.Index(labels, dtype=object)
 
 def auto_generate_risk_mapping(df):
     mapping = {}
-    predefined_scores = {"Critical": 5, "High": 4, "Medium": 3, "Low": 2, "Minimal": 1}
     for col in df.columns:
-        unique_values = df[col].dropna().unique().tolist()
-        mapping[col] = {val: predefined_scores.get(str(val), 1) for val in unique_values}
+        # Unique first (on the column's own array, so Arrow integers stay
+        # integers), then drop missing values from the much shorter result
+        unique_values = pd.unique(df[col].array)
+        labels = _rating_labels(unique_values[~pd.isna(unique_values)])
+        scores = labels.map(_PREDEFINED).fillna(1).astype(np.int8)
+        mapping[col] = dict(zip(labels, scores.tolist()))
     return mapping
 
 def download_risk_mapping(risk_mapping):
-    risk_json = json.dumps(risk_mapping, indent=4)
-    return io.BytesIO(risk_json.encode())
+    # st.download_button takes the bytes as they are; no file object needed
+    return _json_dumps(risk_mapping)
 
-def column_mapping_interface(df):
+def column_mapping_interface(columns):
     st.sidebar.subheader("Map Your Columns")
-    columns = df.columns.tolist()
     mappings = {}
     with st.sidebar.expander("Column Mappings"):
         mappings["Severity"] = st.selectbox("Select Severity Column", columns)
@@ -56,64 +108,169 @@ def column_mapping_interface(df):
 def customize_risk_mapping(df):
     st.sidebar.subheader("Customize Risk Mapping")
     risk_mapping = load_risk_mapping() or auto_generate_risk_mapping(df)
-    updated_mapping = {}
     with st.sidebar.expander("Modify Risk Mapping"):
-        for col in df.columns:
-            st.write(f"### {col} Mapping")
-            col_mapping = risk_mapping.get(col, {})
-            new_mapping = {val: st.number_input(f"{col}: {val}", value=score, step=1) for val, score in col_mapping.items()}
-            updated_mapping[col] = new_mapping
+        # One table for every (column, value) score instead of a widget per value
+        edit_df = pd.DataFrame([(col, str(val), score) for col in df.columns
+                                for val, score in risk_mapping.get(col, {}).items()],
+                               columns=["column", "value", "score"])
+        edited = st.data_editor(edit_df, num_rows="fixed", hide_index=True, disabled=["column", "value"],
+                                column_config={"score": st.column_config.NumberColumn(step=1, required=True)},
+                                key="risk_mapping_editor")
+        # Entries for columns that were not loaded are kept as they are
+        updated_mapping = {col: m for col, m in risk_mapping.items() if col not in df.columns}
+        updated_mapping.update({col: {} for col in df.columns})
+        for col, val, score in zip(edited["column"], edited["value"], edited["score"].tolist()):
+            updated_mapping[col][val] = score
         if st.button("Save Risk Mapping"):
             save_risk_mapping(updated_mapping)
             st.success("Risk mapping updated successfully!")
-    st.sidebar.download_button("Download Risk Mapping", download_risk_mapping(updated_mapping), "risk_config.json", "application/json")
+    st.sidebar.download_button("Download Risk Mapping", data=download_risk_mapping(updated_mapping),
+                               file_name="risk_config.json", mime="application/json")
 
 def convert_text_to_numeric(df, mappings, ignore_columns):
     risk_mapping = load_risk_mapping()
     for col in ["Severity", "Implementation Period", "Impact"]:
         mapped_col = mappings[col]
         if mapped_col in df.columns and mapped_col not in ignore_columns:
-            df[mapped_col] = df[mapped_col].astype(str).str.strip().map(risk_mapping.get(mapped_col, {})).fillna(1)
+            col_mapping = risk_mapping.get(mapped_col, {})
+            # Scores by label position, plus a trailing default of 1 for unmapped labels.
+            # Keys are normalized like the data below; if two keys end up the
+            # same (e.g. "5" and "5.0"), the first one wins.
+            labels = _rating_labels(list(col_mapping))
+            first = ~labels.duplicated()
+            labels = labels[first]
+            scores = np.array([score for score, keep in zip(col_mapping.values(), first) if keep] + [1])
+            # int8 when every score is small enough (|score| <= 31) that a
+            # product of three still fits in int16, int32 otherwise
+            if scores.dtype.kind == "i":
+                scores = scores.astype(np.int8 if np.abs(scores).max() <= 31 else np.int32)
+            # Strip and look up each distinct value once; unknown labels and
+            # missing values get code -1, which selects the default score
+            codes, uniques = pd.factorize(df[mapped_col])
+            label_codes = np.append(labels.get_indexer(_rating_labels(uniques)), -1)
+            df[mapped_col] = scores[label_codes[codes]]
     return df
 
 def calculate_risk_score(df, mappings, ignore_columns):
     df = convert_text_to_numeric(df, mappings, ignore_columns)
-    df['Risk Score'] = df[mappings['Severity']] * df[mappings['Implementation Period']] * df[mappings['Impact']]
+    # Multiply the raw arrays, with no intermediate Series. The first factor is
+    # widened to at least int16 so no partial product is computed in int8.
+    severity = df[mappings['Severity']].to_numpy()
+    severity = severity.astype(np.promote_types(severity.dtype, np.int16))
+    period = df[mappings['Implementation Period']].to_numpy()
+    impact = df[mappings['Impact']].to_numpy()
+    df['Risk Score'] = severity * period * impact
     return df
 
+def get_chart_axes():
+    # One figure per session, cleared between charts so reruns don't pile up figures
+    if "chart_fig" not in st.session_state:
+        fig = Figure(figsize=(12, 8))
+        st.session_state.chart_fig, st.session_state.chart_ax = fig, fig.add_subplot()
+        st.session_state.chart_cbar = None
+    ax = st.session_state.chart_ax
+    if st.session_state.chart_cbar is not None:
+        st.session_state.chart_cbar.remove()
+        st.session_state.chart_cbar = None
+    ax.clear()
+    return st.session_state.chart_fig, ax
+
+# Mean score per (Initiative, Division): the rows are aggregated before anything is reshaped.
+# Cached on the frame and column names, so switching between the pivot charts reuses it.
+@st.cache_data(show_spinner=False, max_entries=16)
+def _risk_agg(df, init_col, div_col):
+    return df.groupby([init_col, div_col], observed=True)["Risk Score"].mean().unstack(fill_value=0)
+
 def visualize_risk_chart(df, chart_type, mappings):
     custom_cmap = get_corporate_cmap()
+    # Narrow frame for the groupby/plot code: the key columns keep their arrays
+    # (and dtype), the score is a C-contiguous array of its own
+    initiative, division = mappings["Initiative"], mappings["Division"]
+    df = pd.DataFrame({initiative: df[initiative].array, division: df[division].array,
+                       "Risk Score": np.ascontiguousarray(df["Risk Score"].to_numpy())})
     st.write("### Risk Visualization")
-    plt.figure(figsize=(12, 8))
+    fig, ax = get_chart_axes()
     if chart_type == "Bubble Chart":
-        scatter = plt.scatter(df[mappings["Division"]], df[mappings["Initiative"]],
-                              s=df["Risk Score"] * 100, c=df["Risk Score"], cmap=custom_cmap, alpha=0.8, edgecolors="black")
-        plt.colorbar(scatter, label="Risk Score")
-        plt.xticks(rotation=45)
-        plt.xlabel("Division")
-        plt.ylabel("Initiative")
-        plt.title("Risk Bubble Chart")
+        scatter = ax.scatter(df[mappings["Division"]], df[mappings["Initiative"]],
+                             s=df["Risk Score"] * 100.0, c=df["Risk Score"], cmap=custom_cmap, alpha=0.8, edgecolors="black")
+        st.session_state.chart_cbar = fig.colorbar(scatter, ax=ax, label="Risk Score")
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.set_xlabel("Division")
+        ax.set_ylabel("Initiative")
+        ax.set_title("Risk Bubble Chart")
     elif chart_type == "Heatmap":
-        pivot_df = df.pivot_table(index=mappings["Initiative"], columns=mappings["Division"], values="Risk Score", aggfunc="mean").fillna(0)
-        sns.heatmap(pivot_df, annot=True, cmap=custom_cmap, linewidths=0.5, linecolor='black', cbar_kws={"label": "Risk Score"})
-        plt.title("Risk Heatmap")
+        pivot_df = _risk_agg(df, initiative, division)
+        mat = pivot_df.to_numpy(np.float32)
+        im = ax.imshow(mat, aspect="auto", cmap=custom_cmap, interpolation="nearest")
+        st.session_state.chart_cbar = fig.colorbar(im, ax=ax, label="Risk Score")
+        ax.set_xticks(range(mat.shape[1]), pivot_df.columns, rotation=45)
+        ax.set_yticks(range(mat.shape[0]), pivot_df.index)
+        # Cell borders from minor-tick gridlines, as one artist rather than one per cell
+        ax.set_xticks(np.arange(mat.shape[1] + 1) - 0.5, minor=True)
+        ax.set_yticks(np.arange(mat.shape[0] + 1) - 0.5, minor=True)
+        ax.grid(which="minor", color="black", linewidth=0.5)
+        ax.tick_params(which="minor", length=0)
+        # Per-cell text only while the grid is small enough to read (and cheap to draw)
+        if mat.size < 400:
+            light = im.norm(mat) > 0.5
+            for i, j in np.ndindex(mat.shape):
+                ax.text(j, i, f"{mat[i, j]:.2g}", ha="center", va="center",
+                        color=NAVY_BLUE if light[i, j] else "white")
+        ax.set_xlabel(mappings["Division"])
+        ax.set_ylabel(mappings["Initiative"])
+        ax.set_title("Risk Heatmap")
     elif chart_type == "Stacked Bar Chart":
-        pivot_df = df.pivot_table(index=mappings["Initiative"], columns=mappings["Division"], values="Risk Score", aggfunc="mean", fill_value=0)
-        pivot_df.plot(kind='bar', stacked=True, colormap=custom_cmap, figsize=(12, 8))
-        plt.xticks(rotation=45)
-        plt.xlabel("Initiative")
-        plt.ylabel("Risk Score")
-        plt.title("Risk Stacked Bar Chart")
-    st.pyplot(plt)
+        pivot_df = _risk_agg(df, initiative, division)
+        pivot_df.plot(kind='bar', stacked=True, colormap=custom_cmap, ax=ax)
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.set_xlabel("Initiative")
+        ax.set_ylabel("Risk Score")
+        ax.set_title("Risk Stacked Bar Chart")
+    st.pyplot(fig)
+
+# Uploads are parsed in two phases: the header alone feeds the column pickers,
+# then only the mapped columns are read. Both are cached on the file's name and bytes,
+# with a few entries each so frames from old uploads and column picks are evicted.
+@st.cache_data(show_spinner=False, max_entries=8)
+def read_uploaded_columns(name, data):
+    buf = io.BytesIO(data)
+    header = pd.read_csv(buf, nrows=0) if name.endswith('.csv') else pd.read_excel(buf, nrows=0)
+    return header.columns.tolist()
+
+# Columns are selected by position and named from the header read: the engines
+# name blank, duplicate or numeric headers differently, so names would not match
+@st.cache_data(show_spinner=False, max_entries=4)
+def read_uploaded_file(name, data, columns, positions):
+    buf = io.BytesIO(data)
+    # Arrow-backed columns: strings stay in Arrow buffers instead of Python objects
+    if name.endswith('.csv'):
+        # The pyarrow engine only selects by (its own) names, so parse the file
+        # and pick the columns by position afterwards
+        df = pd.read_csv(buf, engine="pyarrow", dtype_backend="pyarrow").iloc[:, positions]
+    else:
+        df = pd.read_excel(buf, usecols=positions, dtype_backend="pyarrow")
+    df.columns = [columns[i] for i in positions]
+    return df
 
 def main():
     st.title("Enhanced Risk Assessment Dashboard")
     uploaded_file = st.file_uploader("Upload a CSV or Excel file", type=["csv", "xlsx"])
     if uploaded_file:
-        df = pd.read_csv(uploaded_file) if uploaded_file.name.endswith('.csv') else pd.read_excel(uploaded_file)
-        mappings, ignore_columns = column_mapping_interface(df)
+        data = uploaded_file.getvalue()
+        columns = read_uploaded_columns(uploaded_file.name, data)
+        mappings, ignore_columns = column_mapping_interface(columns)
+        mapped = set(mappings.values())
+        positions = [i for i, col in enumerate(columns) if col in mapped]
+        df = read_uploaded_file(uploaded_file.name, data, columns, positions)
         customize_risk_mapping(df)
         df = calculate_risk_score(df, mappings, ignore_columns)
+        # Categorical group keys: every chart then groups on int codes, not strings
+        for key in ("Division", "Initiative"):
+            col = mappings[key]
+            if pd.api.types.is_string_dtype(df[col].dtype):
+                df[col] = df[col].astype("category")
+        # Only the mapped columns and the score go to the browser and the charts
+        df = df[list(dict.fromkeys(mappings.values())) + ["Risk Score"]]
         st.write("### Processed Data")
         st.dataframe(df)
         chart_type = st.selectbox("Select Chart Type", ["Bubble Chart", "Heatmap", "Stacked Bar Chart"])